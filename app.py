@@ -8,6 +8,8 @@ e‑commerce store.  Built with Streamlit + Plotly.
 import os
 import subprocess
 import sys
+import threading
+from typing import Optional
 
 import numpy as np
 import pandas as pd
@@ -25,14 +27,25 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# ---------------------------------------------------------------------------
+# Web fonts
+# ---------------------------------------------------------------------------
+# Linked (not @import-ed from the <style> block) so both stylesheets download in
+# parallel with the page. Icons keep display=block so ligature names never
+# flash as text; only the Inter weights the CSS uses are requested.
+FONT_LINKS = """
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;700&display=swap">
+<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Material+Symbols+Rounded:opsz,wght,FILL,GRAD@24,400,1,0&display=block">
+"""
+st.markdown(FONT_LINKS, unsafe_allow_html=True)
+
 # ---------------------------------------------------------------------------
 # Custom CSS
 # ---------------------------------------------------------------------------
 CUSTOM_CSS = """
 <style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-@import url('https://fonts.googleapis.com/css2?family=Material+Symbols+Rounded:opsz,wght,FILL,GRAD@24,400,1,0');
-
 /* ---------- root variables ---------- */
 :root {
     --bg: #f4f1ee;
@@ -214,33 +227,284 @@ st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 # Data loading
 # ---------------------------------------------------------------------------
 DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "shopify_orders.csv")
+# Bump whenever the sidecar's derived columns, dtypes or row order change, so
+# a sidecar written by an older version is rebuilt instead of served.
+SIDECAR_VERSION = 2
+PARQUET_PATH = DATA_PATH.replace(".csv", f".v{SIDECAR_VERSION}.parquet")
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Explicit column types: low-cardinality strings become categoricals and
+# money columns stay single precision, so the CSV parser skips inference.
+DTYPES = {
+    "product_name": "category",
+    "product_category": "category",
+    "discount_code": "category",
+    "customer_id": "category",
+    "customer_country": "category",
+    "payment_method": "category",
+    "shipping_method": "category",
+    "order_status": "category",
+    "quantity": "int32",
+    "unit_price": "float32",
+    "discount_amount": "float32",
+    "total_price": "float32",
+    "shipping_cost": "float32",
+}
+
+
+def _convert_csv_to_parquet() -> None:
+    """Parse the generated CSV once, add derived columns and write the Parquet sidecar."""
+    df = pd.read_csv(DATA_PATH, dtype=DTYPES, parse_dates=["order_date"], engine="pyarrow")
+    # Keep rows in date order so the date filter can binary-search instead of masking
+    df = df.sort_values("order_date", ignore_index=True)
+    # Truncate to month with a plain numpy cast instead of a Period round-trip
+    df["order_month"] = df["order_date"].values.astype("datetime64[M]").astype("datetime64[ns]")
+    df["order_weekday"] = pd.Categorical(df["order_date"].dt.day_name(), categories=DAY_ORDER, ordered=True)
+    df["order_hour"] = df["order_date"].dt.hour.astype("int8")
+    # Write beside the target and swap it in, so an interrupted write never
+    # leaves a truncated sidecar that looks fresher than the CSV
+    tmp_path = PARQUET_PATH + ".tmp"
+    df.to_parquet(tmp_path, engine="pyarrow", compression="zstd", index=False)
+    os.replace(tmp_path, PARQUET_PATH)
+
+
+# Sessions run in threads of one server process; only one of them may
+# generate the CSV or rebuild the sidecar at a time.
+_DATA_LOCK = threading.Lock()
+
+
+def _sidecar_fresh() -> bool:
+    return os.path.exists(PARQUET_PATH) and (
+        not os.path.exists(DATA_PATH) or os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(DATA_PATH)
+    )
+
+
+def ensure_data() -> None:
+    """Generate the CSV and (re)build its Parquet sidecar when missing, stale or from an older SIDECAR_VERSION."""
+    if _sidecar_fresh():
+        return
+    with _DATA_LOCK, st.spinner("Preparing order data …"):
+        # Another session may have prepared the data while this one waited
+        if _sidecar_fresh():
+            return
+        if not os.path.exists(DATA_PATH):
+            subprocess.check_call([sys.executable, "generate_data.py"], cwd=os.path.dirname(os.path.abspath(__file__)))
+        _convert_csv_to_parquet()
 
 
-@st.cache_data(show_spinner="Loading order data …")
+@st.cache_resource(show_spinner="Loading order data …")
 def load_data() -> pd.DataFrame:
-    if not os.path.exists(DATA_PATH):
-        subprocess.check_call([sys.executable, "generate_data.py"], cwd=os.path.dirname(os.path.abspath(__file__)))
-    df = pd.read_csv(DATA_PATH, parse_dates=["order_date"])
-    df["unit_price"] = df["unit_price"].astype(float)
-    df["total_price"] = df["total_price"].astype(float)
-    df["discount_amount"] = df["discount_amount"].astype(float)
-    df["shipping_cost"] = df["shipping_cost"].astype(float)
-    df["order_month"] = df["order_date"].dt.to_period("M").dt.to_timestamp()
-    df["order_weekday"] = df["order_date"].dt.day_name()
-    df["order_hour"] = df["order_date"].dt.hour
-    return df
+    # One shared frame for the process instead of an unpickled copy per caller;
+    # _filter, load_cube and filter_options only read it.
+    return pd.read_parquet(PARQUET_PATH, engine="pyarrow")
+
+
+@st.cache_resource(show_spinner=False)
+def load_cube() -> pd.DataFrame:
+    """Revenue and order counts per (day, category, country, status), sorted by day."""
+    df = load_data()
+    day = df["order_date"].dt.floor("D").rename("order_day")
+    cube = (
+        df["total_price"].astype(np.float64)
+        .groupby([day, df["product_category"], df["customer_country"], df["order_status"]], observed=True)
+        .agg(rev="sum", orders="size")
+        .reset_index()
+    )
+    cube["order_month"] = cube["order_day"].values.astype("datetime64[M]").astype("datetime64[ns]")
+    return cube
+
+
+@st.cache_data(show_spinner=False)
+def filter_options() -> dict:
+    """Sidebar date bounds and sorted option lists, computed once per dataset."""
+    df = load_data()
+    return {
+        # Rows are sorted by order_date
+        "min_date": df["order_date"].iloc[0].date(),
+        "max_date": df["order_date"].iloc[-1].date(),
+        "categories": sorted(df["product_category"].cat.categories),
+        "countries": sorted(df["customer_country"].cat.categories),
+        "statuses": sorted(df["order_status"].cat.categories),
+    }
 
 
-df_raw = load_data()
+ensure_data()
+options = filter_options()
+
+# ---------------------------------------------------------------------------
+# Cached aggregations
+# ---------------------------------------------------------------------------
+# Every aggregation is keyed on the sidebar filter values
+# (start, end, categories, countries, statuses), so reruns that do not change
+# the filters reuse the small aggregated frames instead of recomputing them.
+
+def _code_mask(col: pd.Series, values) -> np.ndarray:
+    """Boolean mask of rows whose categorical value is in *values*, compared on codes."""
+    codes = col.cat.codes.to_numpy()
+    if len(values) == len(col.cat.categories):
+        return np.ones(len(codes), dtype=bool)
+    return np.isin(codes, col.cat.categories.get_indexer(list(values)))
+
+
+def _code_sums(col: pd.Series, values: pd.Series) -> np.ndarray:
+    """Per-category totals of *values*, indexed by the categorical codes of *col*."""
+    return np.bincount(
+        col.cat.codes.to_numpy(),
+        weights=values.to_numpy(dtype=np.float64),
+        minlength=len(col.cat.categories),
+    )
+
+
+def _top_n(col: pd.Series, values: pd.Series, n: int = 10) -> pd.Series:
+    """The *n* largest per-category totals of *values*, smallest first for horizontal bars."""
+    sums = _code_sums(col, values)
+    idx = np.flatnonzero(np.bincount(col.cat.codes.to_numpy(), minlength=len(sums)))
+    if len(idx) > n:
+        # Partial selection of the top n, then sort only those
+        idx = idx[np.argpartition(-sums[idx], n - 1)[:n]]
+    idx = idx[np.argsort(sums[idx])]
+    return pd.Series(sums[idx], index=col.cat.categories[idx])
+
+
+def _revenue_by(df: pd.DataFrame, col: str) -> pd.Series:
+    """Revenue per category of *col*, largest first, skipping categories with none."""
+    sums = _code_sums(df[col], df["total_price"])
+    idx = np.flatnonzero(sums)
+    idx = idx[np.argsort(-sums[idx], kind="stable")]
+    return pd.Series(sums[idx], index=df[col].cat.categories[idx])
+
+
+def _select(frame: pd.DataFrame, date_col: str, start, end, cats, countries, statuses) -> pd.DataFrame:
+    """Rows of a date-sorted *frame* with *date_col* in [start, end + 1 day) matching the sidebar filters."""
+    # Rows are sorted by date, so the date window is a contiguous slice
+    dates = frame[date_col].values
+    # One half-open window for orders and the daily cube alike
+    lo = np.searchsorted(dates, start.to_datetime64(), side="left")
+    hi = np.searchsorted(dates, (end + pd.Timedelta(days=1)).to_datetime64(), side="left")
+    sub = frame.iloc[lo:hi]
+    mask = (
+        _code_mask(sub["product_category"], cats)
+        & _code_mask(sub["customer_country"], countries)
+        & _code_mask(sub["order_status"], statuses)
+    )
+    return sub if mask.all() else sub[mask]
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _filter(start, end, cats, countries, statuses) -> pd.DataFrame:
+    # cache_resource hands back the same frame without copying; callers only read it.
+    return _select(load_data(), "order_date", start, end, cats, countries, statuses)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def kpi_agg(start, end, cats, countries, statuses) -> dict:
+    df = _filter(start, end, cats, countries, statuses)
+    total_orders = len(df)
+    # Prices are stored as float32; accumulate the KPI totals in float64
+    price = df["total_price"].to_numpy(dtype=np.float64)
+
+    # Simple delta: compare last 30 days vs prior 30 days in filtered set,
+    # reduced straight from the numpy arrays rather than two filtered copies
+    rev_delta = None
+    orders_delta = None
+    if total_orders:
+        dates = df["order_date"].values
+        days = (dates.max() - dates) / np.timedelta64(1, "D")
+        m_last = days <= 30
+        m_prev = (days > 30) & (days <= 60)
+        r_last, r_prev = price[m_last].sum(), price[m_prev].sum()
+        n_last, n_prev = int(m_last.sum()), int(m_prev.sum())
+
+        if n_prev and r_prev:
+            rev_delta = f"{(r_last / r_prev - 1) * 100:+.1f}%"
+        if n_prev:
+            orders_delta = f"{(n_last / n_prev - 1) * 100:+.1f}%"
+
+    return {
+        "total_revenue": float(price.sum()),
+        "total_orders": total_orders,
+        "avg_order_value": float(price.mean()) if total_orders else 0,
+        "best_product": (
+            df["product_name"].cat.categories[_code_sums(df["product_name"], df["total_price"]).argmax()]
+            if total_orders
+            else "—"
+        ),
+        "total_customers": int(pd.unique(df["customer_id"].cat.codes.to_numpy()).size) if total_orders else 0,
+        "rev_delta": rev_delta,
+        "orders_delta": orders_delta,
+    }
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def monthly_agg(start, end, cats, countries, statuses) -> pd.DataFrame:
+    # Monthly rollup shared by the revenue, orders and AOV charts, taken from
+    # the daily cube so it scales with the number of days rather than orders
+    cube = _select(load_cube(), "order_day", start, end, cats, countries, statuses)
+    monthly = (
+        cube.groupby("order_month", observed=True, sort=True)
+        .agg(Revenue=("rev", "sum"), Orders=("orders", "sum"))
+        .reset_index()
+        .rename(columns={"order_month": "Month"})
+    )
+    monthly["AOV"] = monthly["Revenue"] / monthly["Orders"]
+    return monthly
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def heatmap_agg(start, end, cats, countries, statuses) -> np.ndarray:
+    df = _filter(start, end, cats, countries, statuses)
+    # Dense 7 × 24 order counts; weekday codes already run Monday → Sunday
+    wd = df["order_weekday"].cat.codes.to_numpy().astype(np.intp)
+    hr = df["order_hour"].to_numpy().astype(np.intp)
+    return np.bincount(wd * 24 + hr, minlength=7 * 24).reshape(7, 24)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def status_agg(start, end, cats, countries, statuses) -> pd.Series:
+    df = _filter(start, end, cats, countries, statuses)
+    counts = df["order_status"].value_counts()
+    return counts[counts > 0]
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def top10_agg(start, end, cats, countries, statuses) -> pd.Series:
+    df = _filter(start, end, cats, countries, statuses)
+    return _top_n(df["product_name"], df["total_price"])
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def category_agg(start, end, cats, countries, statuses) -> pd.Series:
+    return _revenue_by(_filter(start, end, cats, countries, statuses), "product_category")
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def country_agg(start, end, cats, countries, statuses) -> pd.Series:
+    df = _filter(start, end, cats, countries, statuses)
+    return _top_n(df["customer_country"], df["total_price"])
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def payment_agg(start, end, cats, countries, statuses) -> pd.Series:
+    return _revenue_by(_filter(start, end, cats, countries, statuses), "payment_method")
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def discount_agg(start, end, cats, countries, statuses) -> pd.Series:
+    df = _filter(start, end, cats, countries, statuses)
+    codes = df["discount_code"]
+    # Orders without a code load as missing (code -1) or as an "" category; compare codes, not strings
+    empty = codes.cat.categories.get_loc("") if "" in codes.cat.categories else -1
+    counts = codes[codes.cat.codes.to_numpy() != empty].value_counts()
+    return counts[counts > 0]
 
 # ---------------------------------------------------------------------------
 # Color palette (beauty / rose‑gold theme)
 # ---------------------------------------------------------------------------
-PALETTE = [
+PALETTE = (
     "#c06078", "#e8a0b0", "#7c9885", "#d4a574",
     "#8facc0", "#c9b8d9", "#e6c88a", "#9cb3a0",
     "#d98a94", "#a0c4d8",
-]
+)
 COLORSCALE = "RdPu"
 
 # ---------------------------------------------------------------------------
@@ -253,8 +517,8 @@ with st.sidebar:
     )
 
     # --- Date range ---
-    min_date = df_raw["order_date"].min().date()
-    max_date = df_raw["order_date"].max().date()
+    min_date = options["min_date"]
+    max_date = options["max_date"]
     date_range = st.date_input(
         "Date range",
         value=(min_date, max_date),
@@ -265,19 +529,19 @@ with st.sidebar:
     st.markdown("")
 
     # --- Product category (selectbox with "All" option) ---
-    all_categories = sorted(df_raw["product_category"].unique())
+    all_categories = options["categories"]
     cat_options = ["All Categories"] + all_categories
     cat_choice = st.selectbox("Product Category", cat_options, index=0)
     selected_cats = all_categories if cat_choice == "All Categories" else [cat_choice]
 
     # --- Country (selectbox with "All" option) ---
-    all_countries = sorted(df_raw["customer_country"].unique())
+    all_countries = options["countries"]
     country_options = ["All Countries"] + all_countries
     country_choice = st.selectbox("Country", country_options, index=0)
     selected_countries = all_countries if country_choice == "All Countries" else [country_choice]
 
     # --- Order status (selectbox with "All" option) ---
-    all_statuses = sorted(df_raw["order_status"].unique())
+    all_statuses = options["statuses"]
     status_options = ["All Statuses"] + all_statuses
     status_choice = st.selectbox("Order Status", status_options, index=0)
     selected_statuses = all_statuses if status_choice == "All Statuses" else [status_choice]
@@ -293,13 +557,8 @@ if len(date_range) == 2:
 else:
     start_dt, end_dt = pd.Timestamp(min_date), pd.Timestamp(max_date)
 
-df = df_raw[
-    (df_raw["order_date"] >= start_dt)
-    & (df_raw["order_date"] <= end_dt + pd.Timedelta(days=1))
-    & (df_raw["product_category"].isin(selected_cats))
-    & (df_raw["customer_country"].isin(selected_countries))
-    & (df_raw["order_status"].isin(selected_statuses))
-].copy()
+# Hashable filter key shared by every cached aggregation
+filters = (start_dt, end_dt, tuple(selected_cats), tuple(selected_countries), tuple(selected_statuses))
 
 # ---------------------------------------------------------------------------
 # Header
@@ -318,32 +577,14 @@ st.markdown(
 # ---------------------------------------------------------------------------
 # KPI cards
 # ---------------------------------------------------------------------------
-total_revenue = df["total_price"].sum()
-total_orders = len(df)
-avg_order_value = df["total_price"].mean() if total_orders else 0
-best_product = df.groupby("product_name")["total_price"].sum().idxmax() if total_orders else "—"
-total_customers = df["customer_id"].nunique() if total_orders else 0
-
-# Simple delta: compare last 30 days vs prior 30 days in filtered set
-last_30 = df[df["order_date"] >= df["order_date"].max() - pd.Timedelta(days=30)]
-prev_30 = df[
-    (df["order_date"] >= df["order_date"].max() - pd.Timedelta(days=60))
-    & (df["order_date"] < df["order_date"].max() - pd.Timedelta(days=30))
-]
-rev_delta = None
-if len(prev_30) and prev_30["total_price"].sum():
-    rev_delta = f"{(last_30['total_price'].sum() / prev_30['total_price'].sum() - 1) * 100:+.1f}%"
-
-orders_delta = None
-if len(prev_30):
-    orders_delta = f"{(len(last_30) / len(prev_30) - 1) * 100:+.1f}%"
+kpis = kpi_agg(*filters)
 
 k1, k2, k3, k4, k5 = st.columns(5)
-k1.metric("Total Revenue", f"${total_revenue:,.0f}", delta=rev_delta)
-k2.metric("Total Orders", f"{total_orders:,}", delta=orders_delta)
-k3.metric("Avg Order Value", f"${avg_order_value:,.2f}")
-k4.metric("Best‑Selling Product", best_product)
-k5.metric("Unique Customers", f"{total_customers:,}")
+k1.metric("Total Revenue", f"${kpis['total_revenue']:,.0f}", delta=kpis["rev_delta"])
+k2.metric("Total Orders", f"{kpis['total_orders']:,}", delta=kpis["orders_delta"])
+k3.metric("Avg Order Value", f"${kpis['avg_order_value']:,.2f}")
+k4.metric("Best‑Selling Product", kpis["best_product"])
+k5.metric("Unique Customers", f"{kpis['total_customers']:,}")
 
 st.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
 
@@ -351,20 +592,168 @@ st.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
 # Helper: consistent chart layout
 # ---------------------------------------------------------------------------
 
+_BASE_LAYOUT = dict(
+    template="plotly_white",
+    font=dict(family="Inter, sans-serif", size=12, color="#2e2e2e"),
+    margin=dict(l=40, r=20, t=40, b=40),
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    legend=dict(orientation="h", y=-0.15, x=0.5, xanchor="center"),
+)
+
+
 def _layout(fig, height=400, **kwargs):
-    fig.update_layout(
-        template="plotly_white",
-        font=dict(family="Inter, sans-serif", size=12, color="#2e2e2e"),
-        height=height,
-        margin=dict(l=40, r=20, t=40, b=40),
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        legend=dict(orientation="h", y=-0.15, x=0.5, xanchor="center"),
-        **kwargs,
-    )
+    fig.update_layout(**_BASE_LAYOUT, height=height, **kwargs)
     return fig
 
 
+# ---------------------------------------------------------------------------
+# Cached figures
+# ---------------------------------------------------------------------------
+# Figures are built from the cached aggregations and stored as plain dicts,
+# keyed on the same filter values, so unchanged charts skip Plotly entirely.
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def revenue_fig(start, end, cats, countries, statuses) -> dict:
+    monthly = monthly_agg(start, end, cats, countries, statuses)
+    fig = px.area(
+        monthly[["Month", "Revenue"]], x="Month", y="Revenue",
+        title="Revenue Over Time",
+        color_discrete_sequence=[PALETTE[0]],
+    )
+    fig.update_traces(line_shape="spline", fill="tozeroy", fillcolor="rgba(192,96,120,0.12)")
+    return _layout(fig).to_dict()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def orders_fig(start, end, cats, countries, statuses) -> dict:
+    monthly = monthly_agg(start, end, cats, countries, statuses)
+    fig = px.bar(
+        monthly[["Month", "Orders"]], x="Month", y="Orders",
+        title="Orders Per Month",
+        color_discrete_sequence=[PALETTE[2]],
+    )
+    return _layout(fig).to_dict()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def heatmap_fig(start, end, cats, countries, statuses) -> dict:
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=heatmap_agg(start, end, cats, countries, statuses),
+            x=[f"{h}:00" for h in range(24)],
+            y=DAY_ORDER,
+            colorscale=COLORSCALE,
+            hoverongaps=False,
+        )
+    )
+    fig.update_layout(title="Orders by Day & Hour")
+    return _layout(fig, height=380).to_dict()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def status_fig(start, end, cats, countries, statuses) -> dict:
+    status_counts = status_agg(start, end, cats, countries, statuses)
+    fig = go.Figure(
+        go.Bar(
+            x=status_counts.values, y=status_counts.index.astype(str), orientation="h",
+            marker_color=PALETTE[:len(status_counts)],
+            hovertemplate="Status=%{y}<br>Orders=%{x}<extra></extra>",
+        )
+    )
+    fig.update_layout(title="Orders by Status", xaxis_title="Orders", yaxis_title="Status", showlegend=False)
+    return _layout(fig, height=380).to_dict()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def top10_fig(start, end, cats, countries, statuses) -> dict:
+    top10 = top10_agg(start, end, cats, countries, statuses)
+    fig = go.Figure(
+        go.Bar(
+            x=top10.values, y=top10.index.astype(str), orientation="h",
+            marker_color=PALETTE[0],
+            hovertemplate="Product=%{y}<br>Revenue=%{x}<extra></extra>",
+        )
+    )
+    fig.update_layout(title="Top 10 Products by Revenue", xaxis_title="Revenue", yaxis_title="Product")
+    return _layout(fig, height=420).to_dict()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def category_fig(start, end, cats, countries, statuses) -> dict:
+    cat_rev = category_agg(start, end, cats, countries, statuses)
+    fig = go.Figure(
+        go.Pie(
+            labels=cat_rev.index.astype(str), values=cat_rev.values,
+            marker_colors=PALETTE[:len(cat_rev)],
+            hole=0.45,
+            hovertemplate="Category=%{label}<br>Revenue=%{value}<extra></extra>",
+        )
+    )
+    fig.update_layout(title="Revenue by Category")
+    fig.update_traces(textinfo="percent+label", textposition="outside")
+    return _layout(fig, height=420).to_dict()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def country_fig(start, end, cats, countries, statuses) -> dict:
+    country_rev = country_agg(start, end, cats, countries, statuses)
+    fig = go.Figure(
+        go.Bar(
+            x=country_rev.values, y=country_rev.index.astype(str), orientation="h",
+            marker_color=PALETTE[4],
+            hovertemplate="Country=%{y}<br>Revenue=%{x}<extra></extra>",
+        )
+    )
+    fig.update_layout(title="Top 10 Countries by Revenue", xaxis_title="Revenue", yaxis_title="Country")
+    return _layout(fig, height=400).to_dict()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def payment_fig(start, end, cats, countries, statuses) -> dict:
+    pay_rev = payment_agg(start, end, cats, countries, statuses)
+    fig = go.Figure(
+        go.Pie(
+            labels=pay_rev.index.astype(str), values=pay_rev.values,
+            marker_colors=PALETTE[:len(pay_rev)],
+            hole=0.45,
+            hovertemplate="Method=%{label}<br>Revenue=%{value}<extra></extra>",
+        )
+    )
+    fig.update_layout(title="Revenue by Payment Method")
+    fig.update_traces(textinfo="percent+label", textposition="outside")
+    return _layout(fig, height=400).to_dict()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def discount_fig(start, end, cats, countries, statuses) -> Optional[dict]:
+    disc_counts = discount_agg(start, end, cats, countries, statuses)
+    if not len(disc_counts):
+        return None
+    fig = go.Figure(
+        go.Bar(
+            x=disc_counts.values, y=disc_counts.index.astype(str), orientation="h",
+            marker_color=PALETTE[3],
+            hovertemplate="Code=%{y}<br>Times Used=%{x}<extra></extra>",
+        )
+    )
+    fig.update_layout(title="Most Popular Discount Codes", xaxis_title="Times Used", yaxis_title="Code")
+    return _layout(fig, height=380).to_dict()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def aov_fig(start, end, cats, countries, statuses) -> dict:
+    monthly = monthly_agg(start, end, cats, countries, statuses)
+    fig = px.line(
+        monthly[["Month", "AOV"]], x="Month", y="AOV",
+        title="Average Order Value Over Time",
+        color_discrete_sequence=[PALETTE[5]],
+        markers=True,
+    )
+    fig.update_traces(line_shape="spline")
+    return _layout(fig, height=380).to_dict()
+
+
 # ===========================================================================
 # TABBED DASHBOARD SEGMENTS
 # ===========================================================================
@@ -393,36 +782,11 @@ with tab_sales:
 
     # Revenue over time (area chart)
     with c1:
-        rev_monthly = (
-            df.groupby("order_month")["total_price"]
-            .sum()
-            .reset_index()
-            .rename(columns={"order_month": "Month", "total_price": "Revenue"})
-        )
-        fig1 = px.area(
-            rev_monthly, x="Month", y="Revenue",
-            title="Revenue Over Time",
-            color_discrete_sequence=[PALETTE[0]],
-        )
-        fig1.update_traces(line_shape="spline", fill="tozeroy", fillcolor="rgba(192,96,120,0.12)")
-        _layout(fig1)
-        st.plotly_chart(fig1, use_container_width=True)
+        st.plotly_chart(revenue_fig(*filters), use_container_width=True)
 
     # Orders per month (bar chart)
     with c2:
-        orders_monthly = (
-            df.groupby("order_month")["order_id"]
-            .count()
-            .reset_index()
-            .rename(columns={"order_month": "Month", "order_id": "Orders"})
-        )
-        fig2 = px.bar(
-            orders_monthly, x="Month", y="Orders",
-            title="Orders Per Month",
-            color_discrete_sequence=[PALETTE[2]],
-        )
-        _layout(fig2)
-        st.plotly_chart(fig2, use_container_width=True)
+        st.plotly_chart(orders_fig(*filters), use_container_width=True)
 
     st.markdown("<div style='height:24px'></div>", unsafe_allow_html=True)
 
@@ -441,46 +805,11 @@ with tab_sales:
 
     # Day × Hour heatmap
     with c7:
-        day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        heatmap_data = (
-            df.groupby(["order_weekday", "order_hour"])["order_id"]
-            .count()
-            .reset_index()
-            .rename(columns={"order_weekday": "Day", "order_hour": "Hour", "order_id": "Orders"})
-        )
-        heatmap_pivot = heatmap_data.pivot(index="Day", columns="Hour", values="Orders").fillna(0)
-        heatmap_pivot = heatmap_pivot.reindex(day_order)
-
-        fig7 = go.Figure(
-            data=go.Heatmap(
-                z=heatmap_pivot.values,
-                x=[f"{h}:00" for h in heatmap_pivot.columns],
-                y=heatmap_pivot.index,
-                colorscale="RdPu",
-                hoverongaps=False,
-            )
-        )
-        fig7.update_layout(title="Orders by Day & Hour")
-        _layout(fig7, height=380)
-        st.plotly_chart(fig7, use_container_width=True)
+        st.plotly_chart(heatmap_fig(*filters), use_container_width=True)
 
     # Order status breakdown (bar)
     with c8:
-        status_counts = (
-            df["order_status"]
-            .value_counts()
-            .reset_index()
-            .rename(columns={"order_status": "Status", "count": "Orders"})
-        )
-        fig8 = px.bar(
-            status_counts, x="Orders", y="Status", orientation="h",
-            title="Orders by Status",
-            color="Status",
-            color_discrete_sequence=PALETTE,
-        )
-        fig8.update_layout(showlegend=False)
-        _layout(fig8, height=380)
-        st.plotly_chart(fig8, use_container_width=True)
+        st.plotly_chart(status_fig(*filters), use_container_width=True)
 
 
 # ---------------------------------------------------------------------------
@@ -501,40 +830,11 @@ with tab_products:
 
     # Top 10 products by revenue (horizontal bar)
     with c3:
-        top10 = (
-            df.groupby("product_name")["total_price"]
-            .sum()
-            .nlargest(10)
-            .sort_values()
-            .reset_index()
-            .rename(columns={"product_name": "Product", "total_price": "Revenue"})
-        )
-        fig3 = px.bar(
-            top10, x="Revenue", y="Product", orientation="h",
-            title="Top 10 Products by Revenue",
-            color_discrete_sequence=[PALETTE[0]],
-        )
-        _layout(fig3, height=420)
-        st.plotly_chart(fig3, use_container_width=True)
+        st.plotly_chart(top10_fig(*filters), use_container_width=True)
 
     # Revenue by category (donut)
     with c4:
-        cat_rev = (
-            df.groupby("product_category")["total_price"]
-            .sum()
-            .reset_index()
-            .rename(columns={"product_category": "Category", "total_price": "Revenue"})
-            .sort_values("Revenue", ascending=False)
-        )
-        fig4 = px.pie(
-            cat_rev, names="Category", values="Revenue",
-            title="Revenue by Category",
-            color_discrete_sequence=PALETTE,
-            hole=0.45,
-        )
-        fig4.update_traces(textinfo="percent+label", textposition="outside")
-        _layout(fig4, height=420)
-        st.plotly_chart(fig4, use_container_width=True)
+        st.plotly_chart(category_fig(*filters), use_container_width=True)
 
 
 # ---------------------------------------------------------------------------
@@ -555,40 +855,11 @@ with tab_customers:
 
     # Revenue by country (bar chart)
     with c5:
-        country_rev = (
-            df.groupby("customer_country")["total_price"]
-            .sum()
-            .nlargest(10)
-            .sort_values()
-            .reset_index()
-            .rename(columns={"customer_country": "Country", "total_price": "Revenue"})
-        )
-        fig5 = px.bar(
-            country_rev, x="Revenue", y="Country", orientation="h",
-            title="Top 10 Countries by Revenue",
-            color_discrete_sequence=[PALETTE[4]],
-        )
-        _layout(fig5, height=400)
-        st.plotly_chart(fig5, use_container_width=True)
+        st.plotly_chart(country_fig(*filters), use_container_width=True)
 
     # Payment method breakdown (pie)
     with c6:
-        pay_rev = (
-            df.groupby("payment_method")["total_price"]
-            .sum()
-            .reset_index()
-            .rename(columns={"payment_method": "Method", "total_price": "Revenue"})
-            .sort_values("Revenue", ascending=False)
-        )
-        fig6 = px.pie(
-            pay_rev, names="Method", values="Revenue",
-            title="Revenue by Payment Method",
-            color_discrete_sequence=PALETTE,
-            hole=0.45,
-        )
-        fig6.update_traces(textinfo="percent+label", textposition="outside")
-        _layout(fig6, height=400)
-        st.plotly_chart(fig6, use_container_width=True)
+        st.plotly_chart(payment_fig(*filters), use_container_width=True)
 
 
 # ---------------------------------------------------------------------------
@@ -609,38 +880,12 @@ with tab_discounts:
 
     # Discount code usage (bar)
     with c9:
-        disc_df = df[df["discount_code"] != ""].copy()
-        if len(disc_df):
-            disc_counts = (
-                disc_df["discount_code"]
-                .value_counts()
-                .reset_index()
-                .rename(columns={"discount_code": "Code", "count": "Times Used"})
-            )
-            fig9 = px.bar(
-                disc_counts, x="Times Used", y="Code", orientation="h",
-                title="Most Popular Discount Codes",
-                color_discrete_sequence=[PALETTE[3]],
-            )
-            _layout(fig9, height=380)
+        fig9 = discount_fig(*filters)
+        if fig9 is not None:
             st.plotly_chart(fig9, use_container_width=True)
         else:
             st.info("No discount codes used in the selected period.")
 
     # Average order value trend (line)
     with c10:
-        aov_monthly = (
-            df.groupby("order_month")["total_price"]
-            .mean()
-            .reset_index()
-            .rename(columns={"order_month": "Month", "total_price": "AOV"})
-        )
-        fig10 = px.line(
-            aov_monthly, x="Month", y="AOV",
-            title="Average Order Value Over Time",
-            color_discrete_sequence=[PALETTE[5]],
-            markers=True,
-        )
-        fig10.update_traces(line_shape="spline")
-        _layout(fig10, height=380)
-        st.plotly_chart(fig10, use_container_width=True)
+        st.plotly_chart(aov_fig(*filters), use_container_width=True)
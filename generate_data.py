@@ -3,16 +3,17 @@ Generate a realistic Shopify-style dataset for a fictional online beauty store.
 Produces 50,000–80,000 orders over 18 months with seasonal patterns.
 """
 
-import csv
 import os
-import random
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 SEED = 42
-random.seed(SEED)
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "shopify_orders.csv")
@@ -107,6 +108,9 @@ DISCOUNT_CODES = [
     "HOLIDAY15", "NEWYEAR20", "BDAY10",
 ]
 
+# Percent off for each code, parsed once from the digits in its name
+DISCOUNT_PCT = {code: int("".join(c for c in code if c.isdigit())) for code in DISCOUNT_CODES if code}
+
 SHIPPING_METHODS = [
     ("Standard Shipping", 0.50),
     ("Express Shipping", 0.30),
@@ -118,56 +122,86 @@ SHIPPING_METHODS = [
 # Helpers
 # ---------------------------------------------------------------------------
 
-def weighted_choice(items_with_weights):
-    items, weights = zip(*items_with_weights)
-    return random.choices(items, weights=weights, k=1)[0]
-
-
-def seasonal_multiplier(dt: datetime) -> float:
-    """Return a multiplier that simulates realistic e-commerce seasonality."""
-    month = dt.month
-    day = dt.day
-    # Black Friday / Cyber Monday window (late Nov)
-    if month == 11 and day >= 20:
-        return 2.5
-    # December holiday shopping
-    if month == 12 and day <= 24:
-        return 2.2
-    # Valentine's week
-    if month == 2 and 7 <= day <= 14:
-        return 1.6
-    # Mother's Day bump (early May)
-    if month == 5 and day <= 14:
-        return 1.5
-    # Back-to-school (Aug-Sep)
-    if month in (8, 9):
-        return 1.2
-    # January & July sales
-    if month in (1, 7):
-        return 1.15
-    # Summer lull
-    if month == 6:
-        return 0.85
-    return 1.0
-
-
-def random_date(start: datetime, end: datetime) -> datetime:
-    """Pick a random datetime between start and end, biased by seasonality."""
+class AliasPicker:
+    """Weighted sampler using Vose's alias method: O(n) build, O(1) per draw."""
+
+    def __init__(self, items, weights=None):
+        self.items = np.asarray(items)
+        n = len(self.items)
+        p = np.ones(n) if weights is None else np.asarray(weights, dtype=float)
+        p = p * n / p.sum()
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+        small = [i for i in range(n) if p[i] < 1.0]
+        large = [i for i in range(n) if p[i] >= 1.0]
+        while small and large:
+            lo, hi = small.pop(), large.pop()
+            self.prob[lo] = p[lo]
+            self.alias[lo] = hi
+            p[hi] -= 1.0 - p[lo]
+            (small if p[hi] < 1.0 else large).append(hi)
+
+    @classmethod
+    def from_pairs(cls, items_with_weights):
+        items, weights = zip(*items_with_weights)
+        return cls(items, weights)
+
+    def pick(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        """Draw *k* items: one column index and one uniform per draw."""
+        idx = rng.integers(len(self.items), size=k)
+        idx = np.where(rng.random(k) < self.prob[idx], idx, self.alias[idx])
+        return self.items[idx]
+
+
+def seasonal_multiplier(months: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """Return multipliers that simulate realistic e-commerce seasonality, per (month, day)."""
+    # Earlier conditions take precedence, as in an if/elif chain
+    return np.select(
+        [
+            (months == 11) & (days >= 20),                 # Black Friday / Cyber Monday window (late Nov)
+            (months == 12) & (days <= 24),                 # December holiday shopping
+            (months == 2) & (days >= 7) & (days <= 14),    # Valentine's week
+            (months == 5) & (days <= 14),                  # Mother's Day bump (early May)
+            (months == 8) | (months == 9),                 # Back-to-school (Aug-Sep)
+            (months == 1) | (months == 7),                 # January & July sales
+            months == 6,                                   # Summer lull
+        ],
+        [2.5, 2.2, 1.6, 1.5, 1.2, 1.15, 0.85],
+        default=1.0,
+    )
+
+
+# Seasonal multiplier per calendar day, laid out over a leap year so every
+# (month, day) has a slot; index with SEASONAL_MONTH_START[month - 1] + day - 1.
+_LEAP_DAYS = np.arange("2024-01-01", "2025-01-01", dtype="datetime64[D]")
+SEASONAL_MONTH_START = np.searchsorted(_LEAP_DAYS, np.arange("2024-01", "2025-01", dtype="datetime64[M]"))
+SEASONAL = seasonal_multiplier(
+    _LEAP_DAYS.astype("datetime64[M]").astype(np.int64) % 12 + 1,
+    (_LEAP_DAYS - _LEAP_DAYS.astype("datetime64[M]")).astype(np.int64) + 1,
+)
+
+HOUR_WEIGHTS = np.array([1,1,1,1,1,2,3,4,6,8,9,10,10,9,8,7,7,8,9,10,9,7,4,2], dtype=np.float64)
+
+
+def random_dates(rng: np.random.Generator, start: datetime, end: datetime, size: int) -> np.ndarray:
+    """Draw *size* datetimes between start and end, biased by seasonality."""
     delta = (end - start).days
-    # Keep trying until we accept (rejection sampling with seasonality)
-    while True:
-        day_offset = random.randint(0, delta)
-        dt = start + timedelta(days=day_offset)
-        mult = seasonal_multiplier(dt)
-        if random.random() < mult / 2.6:  # 2.6 is max multiplier
-            hour = random.choices(
-                range(24),
-                weights=[1,1,1,1,1,2,3,4,6,8,9,10,10,9,8,7,7,8,9,10,9,7,4,2],
-                k=1,
-            )[0]
-            minute = random.randint(0, 59)
-            second = random.randint(0, 59)
-            return dt.replace(hour=hour, minute=minute, second=second)
+    # Sample days straight from the seasonal distribution instead of rejection sampling
+    days = np.datetime64(start.date()) + np.arange(delta + 1)
+    month_starts = days.astype("datetime64[M]")
+    months = month_starts.astype(np.int64) % 12 + 1
+    day_weights = SEASONAL[SEASONAL_MONTH_START[months - 1] + (days - month_starts).astype(np.int64)]
+    day_offsets = rng.choice(delta + 1, size=size, p=day_weights / day_weights.sum())
+    hours = rng.choice(24, size=size, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    minutes = rng.integers(0, 60, size=size)
+    seconds = rng.integers(0, 60, size=size)
+    return (
+        np.datetime64(start, "s")
+        + day_offsets.astype("timedelta64[D]")
+        + hours.astype("timedelta64[h]")
+        + minutes.astype("timedelta64[m]")
+        + seconds.astype("timedelta64[s]")
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -177,10 +211,13 @@ def random_date(start: datetime, end: datetime) -> datetime:
 def generate_dataset():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    flat_products = []
-    for cat, prods in PRODUCTS.items():
-        for name, price in prods:
-            flat_products.append((cat, name, price))
+    # Product catalog as parallel arrays, indexed by a drawn product code
+    cat_lookup = np.array([cat for cat, prods in PRODUCTS.items() for _ in prods])
+    name_lookup = np.array([name for prods in PRODUCTS.values() for name, _ in prods])
+    price_lookup = np.array([price for prods in PRODUCTS.values() for _, price in prods])
+    sku_prefix_lookup = np.array([
+        f"{cat[:3].upper()}-{name.split()[0][:4].upper()}-" for cat, name in zip(cat_lookup.tolist(), name_lookup.tolist())
+    ])
 
     # Category popularity weights
     cat_weights = {
@@ -190,7 +227,9 @@ def generate_dataset():
         "Bath & Body": 0.14,
         "Fragrance": 0.10,
     }
-    product_weights = [cat_weights[p[0]] / sum(1 for x in flat_products if x[0] == p[0]) for p in flat_products]
+    # Split each category's weight evenly across its products
+    cat_counts = Counter(cat_lookup.tolist())
+    product_weights = [cat_weights[cat] / cat_counts[cat] for cat in cat_lookup.tolist()]
 
     fieldnames = [
         "order_id",
@@ -213,54 +252,66 @@ def generate_dataset():
 
     customer_pool_size = int(NUM_ORDERS * 0.55)  # ~55% unique customers, ~45% repeat rate
 
-    with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for i in range(1, NUM_ORDERS + 1):
-            cat, product_name, unit_price = random.choices(flat_products, weights=product_weights, k=1)[0]
-            quantity = random.choices([1, 2, 3, 4, 5], weights=[55, 25, 12, 5, 3], k=1)[0]
-
-            discount_code = random.choice(DISCOUNT_CODES)
-            if discount_code:
-                pct = int("".join(c for c in discount_code if c.isdigit()))
-                discount_amount = round(unit_price * quantity * pct / 100, 2)
-            else:
-                discount_amount = 0.00
-
-            total_price = round(unit_price * quantity - discount_amount, 2)
-
-            shipping_method = weighted_choice(SHIPPING_METHODS)
-            if shipping_method == "Free Shipping":
-                shipping_cost = 0.00
-            elif shipping_method == "Standard Shipping":
-                shipping_cost = round(random.uniform(3.99, 6.99), 2)
-            elif shipping_method == "Express Shipping":
-                shipping_cost = round(random.uniform(9.99, 14.99), 2)
-            else:
-                shipping_cost = round(random.uniform(19.99, 29.99), 2)
-
-            sku_prefix = cat[:3].upper()
-            sku = f"{sku_prefix}-{product_name.split()[0][:4].upper()}-{random.randint(100,999)}"
-
-            writer.writerow({
-                "order_id": f"#SB{1000 + i}",
-                "order_date": random_date(START_DATE, END_DATE).strftime("%Y-%m-%d %H:%M:%S"),
-                "product_name": product_name,
-                "product_category": cat,
-                "sku": sku,
-                "quantity": quantity,
-                "unit_price": f"{unit_price:.2f}",
-                "discount_code": discount_code if discount_code else "",
-                "discount_amount": f"{discount_amount:.2f}",
-                "total_price": f"{total_price:.2f}",
-                "customer_id": f"CUST-{random.randint(1, customer_pool_size):06d}",
-                "customer_country": weighted_choice(COUNTRIES),
-                "payment_method": weighted_choice(PAYMENT_METHODS),
-                "shipping_method": shipping_method,
-                "shipping_cost": f"{shipping_cost:.2f}",
-                "order_status": weighted_choice(ORDER_STATUSES),
-            })
+    rng = np.random.default_rng(SEED)
+    order_dates = random_dates(rng, START_DATE, END_DATE, NUM_ORDERS)
+
+    # Discount codes as lookup arrays, indexed by a drawn code
+    code_lookup = np.array([code or "" for code in DISCOUNT_CODES])
+    pct_lookup = np.array([DISCOUNT_PCT.get(code, 0) for code in DISCOUNT_CODES])
+
+    # Draw every column in bulk, one array per field (structure of arrays)
+    product_idx = AliasPicker(np.arange(len(price_lookup)), product_weights).pick(rng, NUM_ORDERS)
+    quantity = AliasPicker([1, 2, 3, 4, 5], [55, 25, 12, 5, 3]).pick(rng, NUM_ORDERS)
+    disc_idx = AliasPicker(np.arange(len(DISCOUNT_CODES))).pick(rng, NUM_ORDERS)
+    ship_idx = AliasPicker(np.arange(len(SHIPPING_METHODS)), [w for _, w in SHIPPING_METHODS]).pick(rng, NUM_ORDERS)
+
+    unit_price = price_lookup[product_idx]
+    discount_amount = np.round(unit_price * quantity * pct_lookup[disc_idx] / 100, 2)
+    total_price = np.round(unit_price * quantity - discount_amount, 2)
+
+    # Shipping fee ranges, aligned with SHIPPING_METHODS (Standard, Express, Free, Overnight)
+    ship_method_lookup = np.array([method for method, _ in SHIPPING_METHODS])
+    ship_low = np.array([3.99, 9.99, 0.00, 19.99])
+    ship_high = np.array([6.99, 14.99, 0.00, 29.99])
+    shipping_cost = np.round(rng.uniform(ship_low[ship_idx], ship_high[ship_idx]), 2)
+    shipping_cost[ship_method_lookup[ship_idx] == "Free Shipping"] = 0.00
+
+    # Format each customer id once, then index the pool per order
+    customer_ids = np.char.add("CUST-", np.char.zfill(np.arange(1, customer_pool_size + 1).astype(str), 6))
+    cust_idx = rng.integers(0, customer_pool_size, size=NUM_ORDERS)
+    sku = np.char.add(sku_prefix_lookup[product_idx], rng.integers(100, 1000, size=NUM_ORDERS).astype("U3"))
+
+    orders = pd.DataFrame({
+        "order_id": np.char.add("#SB", np.arange(1001, NUM_ORDERS + 1001).astype(str)),
+        "order_date": np.char.replace(order_dates.astype("U19"), "T", " "),
+        "product_name": name_lookup[product_idx],
+        "product_category": cat_lookup[product_idx],
+        "sku": sku,
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "discount_code": code_lookup[disc_idx],
+        "discount_amount": discount_amount,
+        "total_price": total_price,
+        "customer_id": customer_ids[cust_idx],
+        "customer_country": AliasPicker.from_pairs(COUNTRIES).pick(rng, NUM_ORDERS),
+        "payment_method": AliasPicker.from_pairs(PAYMENT_METHODS).pick(rng, NUM_ORDERS),
+        "shipping_method": ship_method_lookup[ship_idx],
+        "shipping_cost": shipping_cost,
+        "order_status": AliasPicker.from_pairs(ORDER_STATUSES).pick(rng, NUM_ORDERS),
+    }, columns=fieldnames)
+    # Money columns are already rounded; the C writer formats them to cents
+    payload = memoryview(orders.to_csv(index=False, float_format="%.2f").encode("utf-8"))
+
+    # The whole file (~10 MB) is assembled in memory; hand it to the OS in one go,
+    # beside the target, then swap it in so readers never see a partial CSV
+    tmp_path = OUTPUT_FILE + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while payload:
+            payload = payload[os.write(fd, payload):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, OUTPUT_FILE)
 
     print(f"Generated {NUM_ORDERS:,} orders → {OUTPUT_FILE}")
 